@@ -1,16 +1,22 @@
 import os
 import re
+from types import MappingProxyType
 
+import orjson
 from dotenv import load_dotenv
 
+# .env 中的配置导出到进程环境变量（不覆盖已有的同名变量），requests 读取的代理、CA 证书等环境变量同样生效
 load_dotenv()
 
+# 环境变量快照，导入时读取一次，进程环境变量优先于 .env 中的同名配置
+_ENV = MappingProxyType(dict(os.environ))
+
 
 def validate_rules(rules: dict) -> dict:
     """验证规则字典的正确性，确保 include_words 是列表，fail_regex 是字符串。
 
     :param rules: 待验证的规则字典。
-    :return: 验证通过的规则字典。如果验证失败，使用默认值代替。
+    :return: 验证通过的规则字典，其中 include_words 转换为元组，fail_regex 已预编译为 ``re.Pattern``。
     :raises ValueError: 如果规则的类型不符合要求，抛出错误。
     """
     # 验证 include_words
@@ -27,23 +33,23 @@ def validate_rules(rules: dict) -> dict:
     if not isinstance(fail_regex, str):
         raise ValueError(f"'fail_regex' must be a string. Got: {fail_regex}")
 
-    # 检查正则表达式是否可用
+    # 预编译正则表达式，同时检查其是否可用
     try:
-        re.compile(fail_regex)  # 测试编译
+        compiled_fail_regex = re.compile(fail_regex)
     except re.error as e:
         raise ValueError(
             f"Invalid regex pattern in 'fail_regex': {fail_regex}. Error: {e}"
         )
 
     # 返回验证后的规则
-    return {"include_words": include_words, "fail_regex": fail_regex}
+    return {"include_words": tuple(include_words), "fail_regex": compiled_fail_regex}
 
 
 # ------------------------------
 # Logging Configuration
 # ------------------------------
-# 日志级别，支持 DEBUG, INFO, WARNING, ERROR, CRITICAL
-LOG_LEVEL = "INFO"
+# 日志级别，支持 DEBUG, INFO, WARNING, ERROR, CRITICAL，可通过环境变量 LOG_LEVEL 覆盖
+LOG_LEVEL = _ENV.get("LOG_LEVEL", "INFO")
 
 # 日志格式，包含时间、日志名称、日志级别和消息
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -51,6 +57,12 @@ LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 # 是否启用日志文件输出，如果为 True，日志将同时输出到文件
 ENABLE_LOG_FILE_OUTPUT = True
 
+# ------------------------------
+# Progress Bar Configuration
+# ------------------------------
+# 进度条每完成多少个任务刷新一次，减少终端写入和进度条内部锁的获取次数
+PROGRESS_UPDATE_BATCH_SIZE = 64
+
 # ------------------------------
 # SSL Configuration
 # ------------------------------
@@ -84,19 +96,24 @@ SERVICE_DEFAULT_PORT = 1188
 # 测试数据，包含一段文本及其源语言和目标语言
 TEST_DATA = {"text": "Hello, world!", "source_lang": "EN", "target_lang": "ZH"}
 
+# 预先序列化的测试数据请求体，所有请求共用，避免每次请求重复序列化
+TEST_DATA_JSON = orjson.dumps(TEST_DATA)
+
 # ------------------------------
 # Reply Validation Rules
 # ------------------------------
 # 回复验证规则，包含需要包含的词语和失败的正则表达式
 REPLY_RULE = validate_rules(
-    {"include_words": ["你好", "世界"], "fail_regex": r"[\[\]{}()0-9]]"}
+    {"include_words": ["你好", "世界"], "fail_regex": r"[\[\]{}()0-9]"}
 )
 
 # ------------------------------
 # API Configuration
 # ------------------------------
-# API 路径，从环境变量中获取，支持多个路径，以逗号分隔
-ACCESS_TOKEN_PATH = os.getenv("ACCESS_TOKEN_PATH", "").split(",")
+# API 路径，从环境变量中获取，支持多个路径，以逗号分隔，忽略空路径
+ACCESS_TOKEN_PATH = tuple(
+    path for path in _ENV.get("ACCESS_TOKEN_PATH", "").split(",") if path
+)
 
 # 默认的 API 路径,默认包含 "v1"
 DEFAULT_API_BASE_PATH = ["v1"]
@@ -121,7 +138,7 @@ PROCESS_CERTIFICATE = True
 # ------------------------------
 # Request Headers
 # ------------------------------
-# HTTP 请求头，包含内容类型、设备信息、用户代理等
+# HTTP 请求头，包含内容类型、设备信息、用户代理等，并保持连接以便复用
 REQUEST_HEADERS = {
     "Content-Type": "application/json",
     "Accept": "*/*",
@@ -133,13 +150,14 @@ REQUEST_HEADERS = {
     "User-Agent": "DeepL-iOS/2.9.1 iOS 16.3.0 (iPhone13,2)",
     "x-app-build": "510265",
     "x-app-version": "2.9.1",
+    "Connection": "keep-alive",
 }
 
 # ------------------------------
 # External API Keys
 # ------------------------------
 # Shodan API 密钥，从环境变量中获取
-SHODAN_API_KEY = os.getenv("SHODAN_API_KEY")
+SHODAN_API_KEY = _ENV.get("SHODAN_API_KEY")
 
 if __name__ == "__main__":
     pass
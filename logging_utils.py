@@ -1,16 +1,42 @@
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
 from config import LOG_LEVEL, LOG_FORMAT, ENABLE_LOG_FILE_OUTPUT
 
+# 后台日志监听器，负责将队列中的日志记录写入实际的处理器
+_listener: Optional[QueueListener] = None
+
+
+def _stop_listener() -> None:
+    """停止后台日志监听器，处理队列中剩余的日志记录并关闭其持有的处理器。"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        # 关闭处理器，释放文件日志占用的文件描述符
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
 
 def setup_logger():
     """配置日志记录器，支持文件日志和控制台日志。
 
     日志级别、格式和是否启用文件日志根据配置动态调整。
+    根记录器只挂载一个 QueueHandler，工作线程记录日志时只需将记录放入队列，
+    控制台和文件的写入由后台的 QueueListener 线程完成。
     """
+    root_logger = logging.getLogger()
+
     # 确保日志配置不会重复添加处理器
-    if logging.getLogger().hasHandlers():
-        logging.getLogger().handlers.clear()
+    if root_logger.hasHandlers():
+        root_logger.handlers.clear()
+    _stop_listener()
 
     # 将字符串日志等级转换为对应整数值
     log_level = getattr(logging, LOG_LEVEL.upper(), logging.INFO)  # 默认INFO
@@ -19,14 +45,23 @@ def setup_logger():
     handlers = [logging.StreamHandler()]  # 控制台输出处理器
 
     if ENABLE_LOG_FILE_OUTPUT:
-        # 添加文件日志处理器
-        handlers.append(logging.FileHandler("debug.log", encoding="utf-8"))
-
-    # 配置日志基础设置
-    logging.basicConfig(
-        level=log_level,  # 动态设置日志等级
-        format=LOG_FORMAT or "%(asctime)s - %(levelname)s - %(message)s",  # 默认格式
-        handlers=handlers,
+        # 添加文件日志处理器，延迟到首条日志写入时才打开文件
+        handlers.append(logging.FileHandler("debug.log", encoding="utf-8", delay=True))
+
+    formatter = logging.Formatter(
+        LOG_FORMAT or "%(asctime)s - %(levelname)s - %(message)s"  # 默认格式
     )
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # 启动后台监听器，由其持有实际的处理器
+    global _listener
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers)
+    _listener.start()
+
+    # 配置根记录器
+    root_logger.setLevel(log_level)  # 动态设置日志等级
+    root_logger.addHandler(QueueHandler(log_queue))
 
     logging.info("Logger successfully configured!")
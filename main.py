@@ -1,23 +1,33 @@
 import logging
-from collections.abc import Mapping, Iterable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import sys
+from collections.abc import Callable, Iterable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from dataclasses import dataclass, field, fields
-from typing import Union
+from operator import itemgetter
+from typing import ClassVar, Union, get_origin
+from urllib.parse import urlsplit
 
+import orjson
 import urllib3
-from tqdm import tqdm
 from urllib3.exceptions import InsecureRequestWarning
 
 from config import (
     URL_PROCESSING_MAX_PROCESSES,
     SHOW_SSL_PROGRESS_BAR,
-    TEST_DATA,
+    TEST_DATA_JSON,
     REPLY_RULE,
     SAVE_PROCESSED_DATA,
     SORT_PROCESSED_DATA,
 )
 from logging_utils import setup_logger
-from network_utils import check_endpoint, ProcessedResponse
+from network_utils import check_endpoint, ProcessedResponse, ReturnStatus
+from progress_utils import BatchedProgress
 from url_utils import generate_urls
 
 setup_logger()
@@ -27,7 +37,7 @@ setup_logger()
 urllib3.disable_warnings(InsecureRequestWarning)
 
 
-@dataclass
+@dataclass(slots=True)
 class CategorizedResults:
     """存储所有 URL 的分类结果。
 
@@ -51,75 +61,110 @@ class CategorizedResults:
     timeout_or_unreachable: list[str] = field(default_factory=list)
     failed_urls: list[str] = field(default_factory=list)
 
+    # 所有分类字段的名称及其排序方法，在类定义后一次性计算
+    _FIELD_NAMES: ClassVar[tuple[str, ...]]
+    _SORTERS: ClassVar[dict[str, Callable]]
+
+    # 响应状态到分类字段的映射表，键为 ReturnStatus 或 HTTP 状态码整数
+    # SUCCESS 需按协议区分，单独处理
+    _STATUS_FIELDS: ClassVar[dict[int, str]] = {
+        429: "rate_limited",
+        ReturnStatus.CONTENT_IS_CLOUDFLARE: "cloudflare_blocked",
+        ReturnStatus.INVALID_CONTENT: "invalid_content",
+        ReturnStatus.SERVER_ERROR_50X: "service_unavailable",
+        401: "unauthorized_urls",
+        ReturnStatus.TIME_OUT: "timeout_or_unreachable",
+        ReturnStatus.REQUEST_FAIL: "failed_urls",
+        ReturnStatus.ERROR: "failed_urls",
+    }
+
     def add_result(self, url: str, response: ProcessedResponse) -> None:
         """根据响应结果将 URL 分类到相应的类别中。
 
         :param url: 检查的 URL。
         :param response: 处理后的响应对象。
         """
-        match response.status:
-            case "SUCCESS":
-                if url.startswith("https://"):
-                    self.available_https_endpoints[url] = response.latency
-                else:
-                    self.available_http_endpoints[url] = response.latency
-            case "429":
-                self.rate_limited[url] = response.latency
-            case "CONTENT_IS_CLOUDFLARE":
-                self.cloudflare_blocked[url] = response.latency
-            case "INVALID_CONTENT":
-                self.invalid_content[url] = response.latency
-            case "SERVER_ERROR_50X":
-                self.service_unavailable[url] = response.latency
-            case "401":
-                self.unauthorized_urls[url] = response.latency
-            case "TIME_OUT":
-                self.timeout_or_unreachable.append(url)
-            case "REQUEST_FAIL":
-                self.failed_urls.append(url)
-            case "ERROR":
-                self.failed_urls.append(url)
-            case _:
-                logging.warning(f"Unhandled status: {response.status} for URL: {url}")
-                self.failed_urls.append(url)
+        if response.status == ReturnStatus.SUCCESS:
+            if response.scheme == "https":
+                self.available_https_endpoints[url] = response.latency
+            else:
+                self.available_http_endpoints[url] = response.latency
+            return
+
+        field_name = self._STATUS_FIELDS.get(response.status)
+        if field_name is None:
+            logging.warning(f"Unhandled status: {response.status} for URL: {url}")
+            field_name = "failed_urls"
+
+        target = getattr(self, field_name)
+        if isinstance(target, dict):
+            target[url] = response.latency
+        else:
+            target.append(url)
 
     def to_dict(self) -> dict[str, Union[dict[str, float], list[str]]]:
         """将分类结果转换为字典格式。
 
         :returns: 包含所有分类结果的字典。
         """
-        result_dict = {}
-        for field_ in fields(self):
-            field_name = field_.name
-            field_value = getattr(self, field_name)
-            result_dict[field_name] = field_value
-        return result_dict
+        return {
+            field_name: getattr(self, field_name) for field_name in self._FIELD_NAMES
+        }
 
     def sort(self, field_name: str, reverse: bool = False) -> None:
         """对指定字段进行排序。
 
         :param field_name: 需要排序的字段名称。
         :param reverse: 是否降序排序，默认为升序。
-        :raises ValueError: 如果字段名称无效或字段不支持排序。
+        :raises ValueError: 如果字段名称无效。
         """
-        if not hasattr(self, field_name):
-            raise ValueError(f"Field '{field_name}' does not exist")
+        try:
+            sorter = self._SORTERS[field_name]
+        except KeyError:
+            raise ValueError(f"Field '{field_name}' does not exist") from None
 
-        field_value = getattr(self, field_name)
+        setattr(self, field_name, sorter(getattr(self, field_name), reverse))
 
-        if isinstance(field_value, dict):
-            # Sort dictionary by value, handling -1 latency
-            sorted_items = sorted(
-                field_value.items(),
-                key=lambda x: float("inf") if x[1] == -1 else x[1],
-                reverse=reverse,
-            )
-            setattr(self, field_name, dict(sorted_items))
-        elif isinstance(field_value, list):
-            # Sort list
-            field_value.sort(reverse=reverse)
-        else:
-            raise ValueError(f"Field '{field_name}' is not sortable")
+    @staticmethod
+    def _sort_dict(field_value: dict[str, float], reverse: bool) -> dict[str, float]:
+        """按延迟对字典排序，-1（无效）延迟始终排在末尾。
+
+        :param field_value: URL 到延迟的字典。
+        :param reverse: 是否降序排序。
+        :return: 排序后的新字典。
+        """
+        # Valid latencies are never negative, so -1 entries end up at one end
+        # of the sorted list and only need rotating in ascending order.
+        sorted_items = sorted(field_value.items(), key=itemgetter(1), reverse=reverse)
+        invalid_count = list(field_value.values()).count(-1)
+        if invalid_count and not reverse:
+            sorted_items = sorted_items[invalid_count:] + sorted_items[:invalid_count]
+        return dict(sorted_items)
+
+    @staticmethod
+    def _sort_list(field_value: list[str], reverse: bool) -> list[str]:
+        """对 URL 列表原地排序。
+
+        :param field_value: URL 列表。
+        :param reverse: 是否降序排序。
+        :return: 排序后的同一列表。
+        """
+        field_value.sort(reverse=reverse)
+        return field_value
+
+
+CategorizedResults._FIELD_NAMES = tuple(
+    field_.name for field_ in fields(CategorizedResults)
+)
+# 按字段的声明类型一次性确定排序方法，sort 只需一次字典查找
+CategorizedResults._SORTERS = {
+    field_.name: (
+        CategorizedResults._sort_dict
+        if get_origin(field_.type) is dict
+        else CategorizedResults._sort_list
+    )
+    for field_ in fields(CategorizedResults)
+}
 
 
 def process_urls_with_thread_pool(
@@ -131,31 +176,39 @@ def process_urls_with_thread_pool(
     """
     使用线程池处理 URL 任务。
 
+    任务按批提交，同时在途的任务数不超过 ``max_workers * 2``，内存占用与 URL 数量无关。
+
     :param urls: 需要检查的 URL 列表。
     :param categorized_results: 存储分类结果的对象。
     :param max_workers: 最大线程数。
     :param show_progress: 是否显示进度条。
     """
-    # 初始化线程池
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [
-            executor.submit(check_endpoint, url, TEST_DATA, REPLY_RULE) for url in urls
-        ]
-        # 初始化进度条
-        progress_bar = (
-            tqdm(total=len(urls), desc="Checking APIs") if show_progress else None
-        )
-        for future in as_completed(futures):
-            result = future.result()
-            url, response = result
-            if result:
-                categorized_results.add_result(url, response)
-            if progress_bar:
-                progress_bar.update(1)
-
-        # 关闭进度条
-        if progress_bar:
-            progress_bar.close()
+    max_in_flight = max_workers * 2
+
+    def collect(done_futures: Iterable[Future]) -> None:
+        """将已完成任务的结果写入分类结果。"""
+        for future in done_futures:
+            url, response = future.result()
+            categorized_results.add_result(url, response)
+            progress.advance()
+
+    # 初始化进度条和线程池
+    with (
+        BatchedProgress(len(urls), "Checking APIs", show_progress) as progress,
+        ThreadPoolExecutor(max_workers=max_workers) as executor,
+    ):
+        in_flight = set()
+        for url in urls:
+            # 在途任务已满时，等待至少一个任务完成后再继续提交
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(
+                executor.submit(check_endpoint, url, TEST_DATA_JSON, REPLY_RULE)
+            )
+
+        # 处理剩余的在途任务
+        collect(as_completed(in_flight))
 
 
 def display_results(categorized_results, show_summary=True):
@@ -178,24 +231,23 @@ def display_results(categorized_results, show_summary=True):
         :param emoji: 分类的 Emoji 图标。
         :raises TypeError: 如果 url_dict_or_list 不是字典或列表。
         """
-        if not isinstance(url_dict_or_list, (Mapping, Iterable)):
-            logging.error("url_dict_or_list 必须是字典或列表")
-            raise TypeError("url_dict_or_list 必须是字典或列表")
-
-        print(f"\n{emoji} {title}:")
+        lines = [f"\n{emoji} {title}:"]
 
         # 处理字典或列表
-        if isinstance(url_dict_or_list, Mapping):
-            urls = list(url_dict_or_list.keys())
-            for url in urls:
-                latency = url_dict_or_list[url]
+        if isinstance(url_dict_or_list, dict):
+            for url, latency in url_dict_or_list.items():
                 latency_display = (
                     "Timeout" if latency == float("inf") else f"{latency:.2f} ms"
                 )
-                print(f"{emoji} {url} (Latency: {latency_display})")
+                lines.append(f"{emoji} {url} (Latency: {latency_display})")
+        elif isinstance(url_dict_or_list, list):
+            lines.extend(f"{emoji} {url}" for url in url_dict_or_list)
         else:
-            for url in url_dict_or_list:
-                print(f"{emoji} {url}")
+            logging.error("url_dict_or_list 必须是字典或列表")
+            raise TypeError("url_dict_or_list 必须是字典或列表")
+
+        # 拼接整个分类后一次性写出，避免逐行 print
+        sys.stdout.write("\n".join(lines) + "\n")
 
     # 使用更符合场景的 Emoji
     print_urls(
@@ -231,17 +283,14 @@ def display_results(categorized_results, show_summary=True):
     if show_summary:
         print("\n\U0001F4CA Summary of Results:")  # 📊
         for category, data in categorized_results.to_dict().items():
-            if isinstance(data, dict):
-                print(f"  - {category.replace('_', ' ').title()}: {len(data)} URLs")
-            elif isinstance(data, list):
-                print(f"  - {category.replace('_', ' ').title()}: {len(data)} URLs")
+            print(f"  - {category.replace('_', ' ').title()}: {len(data)} URLs")
 
 
 def main():
     """
     主函数，执行 URL 检查和结果保存工作。
 
-    1. 加载 URL 列表。
+    1. 加载已去重的 URL 列表，并按主机分组。
     2. 如果启用了保存功能，将 URL 列表保存到文件。
     3. 初始化分类结果对象。
     4. 使用线程池检查 URL 并将结果分类。
@@ -254,11 +303,15 @@ def main():
         logging.error("No URLs to check. Exiting.")
         return
 
+    # 按主机分组排序，使同一主机的请求连续提交，复用连接池中的连接
+    # generate_urls 返回的 URL 已去重
+    urls = sorted(urls, key=lambda url: urlsplit(url).netloc)
+
     # 如果启用了保存功能，将 URL 列表保存到文件
     if SAVE_PROCESSED_DATA:
         try:
-            with open("processed_urls.txt", "w", encoding="utf-8") as f:
-                f.write("\n".join(urls))
+            with open("processed_urls.txt", "wb") as f:
+                f.write(("\n".join(urls) + "\n").encode("utf-8"))
             logging.info("URL list saved to processed_urls.txt")
         except IOError as e:
             logging.error(f"Failed to save URL list: {e}")
@@ -275,8 +328,7 @@ def main():
 
     # 排序
     if SORT_PROCESSED_DATA:
-        for field_ in fields(categorized_results):
-            field_name = field_.name
+        for field_name in CategorizedResults._FIELD_NAMES:
             try:
                 categorized_results.sort(field_name)
             except ValueError as e:
@@ -288,10 +340,12 @@ def main():
     # 如果启用了保存功能，将分类结果保存到文件
     if SAVE_PROCESSED_DATA:
         try:
-            with open("categorized_results.json", "w", encoding="utf-8") as f:
-                import json
-
-                json.dump(categorized_results.to_dict(), f, indent=4)
+            with open("categorized_results.json", "wb") as f:
+                f.write(
+                    orjson.dumps(
+                        categorized_results.to_dict(), option=orjson.OPT_INDENT_2
+                    )
+                )
             logging.info("Categorized results saved to categorized_results.json")
         except IOError as e:
             logging.error(f"Failed to save categorized results: {e}")
@@ -1,21 +1,32 @@
+import http.cookiejar
 import logging
 import re
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum, auto
+from enum import IntEnum
 from math import ceil
-from typing import Any, Optional, Union, Type
+from typing import Any, Optional, Union
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
-from config import REPLY_RULE, MAX_ALLOWED_LATENCY_SECONDS, TEST_DATA, REQUEST_HEADERS
+from config import (
+    REPLY_RULE,
+    MAX_ALLOWED_LATENCY_SECONDS,
+    TEST_DATA_JSON,
+    REQUEST_HEADERS,
+    URL_PROCESSING_MAX_PROCESSES,
+)
 
 
-class ReturnStatus(Enum):
+class ReturnStatus(IntEnum):
     """业务逻辑状态枚举类。
 
-    定义了不同的响应内容类型和处理状态。
+    定义了不同的响应内容类型和处理状态。取值为小整数，不与 HTTP 状态码冲突，
+    可与 HTTP 状态码一起作为字典键使用。
 
     :cvar SUCCESS: 处理成功。
     :cvar CONTENT_IS_CLOUDFLARE: 响应内容为 Cloudflare 页面。
@@ -27,57 +38,62 @@ class ReturnStatus(Enum):
     :cvar ERROR: 处理错误。
     """
 
-    SUCCESS = auto()  # 处理成功
-    CONTENT_IS_CLOUDFLARE = auto()  # 响应内容为 Cloudflare 页面
-    UNEXPECTED_CONTENT = auto()  # 其他类型的响应内容
-    INVALID_CONTENT = auto()  # JSON响应但包含未预期内容
-    SERVER_ERROR_50X = auto()  # 50x 服务器错误
-    TIME_OUT = auto()  # 请求超时
-    REQUEST_FAIL = auto()  # 请求失败
-    ERROR = auto()  # 处理错误
+    SUCCESS = 0  # 处理成功
+    CONTENT_IS_CLOUDFLARE = 1  # 响应内容为 Cloudflare 页面
+    UNEXPECTED_CONTENT = 2  # 其他类型的响应内容
+    INVALID_CONTENT = 3  # JSON响应但包含未预期内容
+    SERVER_ERROR_50X = 4  # 50x 服务器错误
+    TIME_OUT = 5  # 请求超时
+    REQUEST_FAIL = 6  # 请求失败
+    ERROR = 7  # 处理错误
 
     def __str__(self) -> str:
         """返回枚举值的字符串表示。"""
         return self.name
 
     @classmethod
-    def from_string(cls, status_str: str) -> Type["ReturnStatus"]:
+    def from_string(cls, status_str: str) -> "ReturnStatus":
         """从字符串获取对应的状态枚举值。
 
         :param status_str: 状态字符串
-        :returns: 对应的状态枚举值，如果不存在返回 None
+        :returns: 对应的状态枚举值，如果不存在返回 ERROR
         """
         try:
             return cls[status_str.upper()]
         except KeyError:
-            return Type[cls.ERROR]
+            return cls.ERROR
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessedResponse:
     """处理后的响应数据类。
 
     用于封装 HTTP 响应或业务处理的结果数据。
 
-    :param status: HTTP状态码或业务状态
+    :param status: 业务状态枚举或 HTTP 状态码
     :param data: 响应数据内容
     :param latency: 处理延迟时间(秒)
-    :param timestamp: 响应处理时间戳
+    :param timestamp: 响应处理时间戳（Unix 时间，秒），仅在序列化时转换为 datetime
+    :param scheme: 请求所用的协议（"https" 或 "http"），由 check_endpoint 填写
     """
 
-    status: Union[ReturnStatus, str, int]
+    status: Union[ReturnStatus, int]
     data: Any = field(default=None)
     latency: float = field(default=0.0)
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: float = field(default_factory=time.time)
+    scheme: str = field(default="")
 
     def __post_init__(self) -> None:
         """数据类初始化后的处理。
 
-        - 确保 status 为字符串类型
+        - 将字符串形式的 status 转换为 HTTP 状态码整数或 ReturnStatus 枚举
         """
-        # 转换状态码为字符串
-        if isinstance(self.status, (int, Enum)):
-            self.status = str(self.status)
+        if isinstance(self.status, str):
+            self.status = (
+                int(self.status)
+                if self.status.isdigit()
+                else ReturnStatus.from_string(self.status)
+            )
 
     def to_dict(self) -> dict[str, Any]:
         """将响应数据转换为字典格式。
@@ -85,10 +101,11 @@ class ProcessedResponse:
         :returns: 包含响应数据的字典
         """
         return {
-            "status": self.status,
+            "status": str(self.status),
             "data": self.data,
             "latency": self.latency,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "scheme": self.scheme,
         }
 
     @classmethod
@@ -99,57 +116,91 @@ class ProcessedResponse:
         :returns: 新响应对象实例
         """
         timestamp = (
-            datetime.fromisoformat(data["timestamp"])
+            datetime.fromisoformat(data["timestamp"]).timestamp()
             if "timestamp" in data
-            else datetime.now()
+            else time.time()
         )
         return cls(
             status=data.get("status", ""),
             data=data.get("data"),
             latency=float(data.get("latency", 0.0)),
             timestamp=timestamp,
+            scheme=data.get("scheme", ""),
         )
 
 
+def create_session(pool_size: int = URL_PROCESSING_MAX_PROCESSES) -> requests.Session:
+    """创建带连接池的 Session，使同一主机的多次请求复用 TCP/TLS 连接。
+
+    Session 不保存任何 Cookie，每次探测与独立的 ``requests.post`` 一样不带状态。
+
+    :param pool_size: 缓存的主机连接池数量及每个连接池的最大连接数，默认与 URL 处理的并发数一致。
+    :return: 已挂载 HTTP 和 HTTPS 连接池适配器的 Session 对象。
+    """
+    session = requests.Session()
+    # 拒绝所有 Cookie：共享的 Cookie 罐会把各服务器下发的 Cookie（如 Cloudflare 的
+    # __cf_bm、cf_clearance）带到后续探测中，使结果依赖请求顺序，且随扫描的主机数不断增长
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    # 探测请求不重试，失败即按结果分类
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=Retry(total=0)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# 模块级共享 Session，供所有工作线程复用连接池
+_SESSION = create_session()
+
+# 请求超时时间，在允许的最大延迟基础上留出余量，导入时计算一次
+_REQUEST_TIMEOUT = MAX_ALLOWED_LATENCY_SECONDS + max(
+    1, ceil(MAX_ALLOWED_LATENCY_SECONDS / 3)
+)
+
+# Cloudflare 拦截页面的特征词（ASCII 字节串，直接在原始响应体中查找）
+_CF_WORDS = (b"Attention Required!", b"Cloudflare")
+
+
 def parse_response_data(response: requests.Response) -> Optional[str]:
     """解析响应对象中的 JSON 数据并提取 "data" 字段。
 
+    直接解析原始字节，跳过 ``response.text`` 的编码探测与解码。
+
     :param response: 包含 JSON 数据的响应对象。
     :return: 如果解析成功，返回 "data" 字段的值；否则返回 None。
     """
     try:
-        return response.json().get("data", "")
-    except (ValueError, AttributeError):
+        return orjson.loads(response.content).get("data", "")
+    except (orjson.JSONDecodeError, AttributeError):
         return None
 
 
-def check_cloudflare_block(response_text: str) -> bool:
-    """检查响应文本是否包含 Cloudflare 拦截信息。
+def check_cloudflare_block(response_content: bytes) -> bool:
+    """检查响应体是否包含 Cloudflare 拦截信息。
 
-    :param response_text: 响应文本内容。
+    :param response_content: 原始响应体字节，无需解码为文本。
     :return: 如果包含 Cloudflare 拦截信息，返回 True；否则返回 False。
     """
-    return any(
-        cf_word in response_text for cf_word in ["Attention Required!", "Cloudflare"]
-    )
+    return any(cf_word in response_content for cf_word in _CF_WORDS)
 
 
 def validate_response_content(
-    response_data: str, rules: dict[str, Union[list[str], str]]
+    response_data: str, rules: dict[str, Union[tuple[str, ...], re.Pattern]]
 ) -> bool:
     """验证响应内容是否符合预设规则。
 
     :param response_data: 需要验证的响应数据。
-    :param rules: 包含验证规则的字典，如 "include_words" 和 "fail_regex"。
+    :param rules: 经 ``validate_rules`` 校验的规则字典，包含 "include_words" 元组和预编译的 "fail_regex"。
     :return: 如果响应内容符合规则，返回 True；否则返回 False。
     """
-    include_words = rules.get("include_words", [])
-    fail_regex = rules.get("fail_regex", "")
+    include_words = rules["include_words"]
+    fail_regex = rules["fail_regex"]
 
     if not all(word in response_data for word in include_words):
         return False
 
-    if re.search(fail_regex, response_data):
+    if fail_regex.search(response_data):
         return False
 
     return True
@@ -159,7 +210,7 @@ def process_successful_response(
     url: str,
     response: requests.Response,
     latency: float,
-    rules: dict[str, Union[list[str], str]],
+    rules: dict[str, Union[tuple[str, ...], re.Pattern]],
 ) -> ProcessedResponse:
     """处理 HTTP 请求的成功响应，验证响应内容是否符合预设规则。
 
@@ -172,7 +223,7 @@ def process_successful_response(
     response_data = parse_response_data(response)
 
     if response_data is None:
-        if check_cloudflare_block(response.text):
+        if check_cloudflare_block(response.content):
             logging.error(f"Failed to get response from {url} because of Cloudflare.")
             return ProcessedResponse(
                 status=ReturnStatus.CONTENT_IS_CLOUDFLARE,
@@ -244,12 +295,15 @@ def handle_error_response(
 
 
 def make_request(
-    url: str, test_data: dict, rules: dict[str, Union[list[str], str]], verify: bool
+    url: str,
+    body: bytes,
+    rules: dict[str, Union[tuple[str, ...], re.Pattern]],
+    verify: bool,
 ) -> ProcessedResponse:
     """发起 HTTP POST 请求，并根据响应状态码和延迟返回结果。
 
     :param url: 请求的目标 URL。
-    :param test_data: 包含请求数据的字典。
+    :param body: 已序列化为 JSON 的请求体。
     :param rules: 应用于响应的规则。
     :param verify: 指定是否验证 HTTPS 证书。
     :return: 如果请求成功，返回包含 URL、延迟信息的字典；如果遇到错误（如超时、服务器错误等），则返回错误代码的字符串。
@@ -257,21 +311,18 @@ def make_request(
     :raises ValueError: 如果输入参数值无效。
     """
     try:
-        start_time = time.time()
-        timeout = MAX_ALLOWED_LATENCY_SECONDS + max(
-            1, ceil(MAX_ALLOWED_LATENCY_SECONDS / 3)
-        )
-        response = requests.post(
+        start_time = time.monotonic()
+        response = _SESSION.post(
             url,
-            json=test_data,
+            data=body,
             headers=REQUEST_HEADERS,
-            timeout=timeout,
+            timeout=_REQUEST_TIMEOUT,
             verify=verify,
         )
-        latency = time.time() - start_time
+        latency = time.monotonic() - start_time
 
-        # 检查 latency 的合理性
-        if latency < 0 or latency > MAX_ALLOWED_LATENCY_SECONDS:
+        # 检查 latency 的合理性（单调时钟不会倒退，只需检查上限）
+        if latency > MAX_ALLOWED_LATENCY_SECONDS:
             logging.warning(f"Unrealistic latency detected: {latency}s for URL: {url}")
             latency = -1  # 使用 -1 表示异常
 
@@ -300,20 +351,21 @@ def make_request(
 
 def check_endpoint(
     url: str,
-    test_data: dict = TEST_DATA,
-    rules: dict[str, Union[list[str], str]] = REPLY_RULE,
+    body: bytes = TEST_DATA_JSON,
+    rules: dict[str, Union[tuple[str, ...], re.Pattern]] = REPLY_RULE,
 ) -> tuple[str, ProcessedResponse]:
     """检查给定的 URL 是否可用，支持 HTTP 和 HTTPS 协议。
 
     :param url: 要检查的基础 URL
-    :param test_data: 请求中发送的数据，默认使用 TEST_DATA
+    :param body: 请求中发送的 JSON 请求体，默认使用预先序列化的 TEST_DATA_JSON
     :param rules: 响应的验证规则，默认使用 REPLY_RULE
 
     :raises RequestException: 当请求发生网络错误时
     :raises ValueError: 当响应不符合预期规则时
     """
-    verify = url.startswith("https://")
-    url_response = make_request(url, test_data, rules, verify=verify)
+    scheme = "https" if url.startswith("https://") else "http"
+    url_response = make_request(url, body, rules, verify=scheme == "https")
+    url_response.scheme = scheme
     return url, url_response
 
 
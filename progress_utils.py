@@ -0,0 +1,57 @@
+from typing import Optional
+
+from tqdm import tqdm
+
+from config import PROGRESS_UPDATE_BATCH_SIZE
+
+
+class BatchedProgress:
+    """按批更新的进度条，完成的任务先在本地计数，每满一批才更新一次 tqdm。
+
+    减少终端写入和进度条内部锁的获取次数；关闭时补齐最后不足一批的进度。
+    可作为上下文管理器使用，退出时自动关闭。
+
+    :param total: 任务总数。
+    :param desc: 进度条描述。
+    :param enabled: 是否显示进度条，关闭时只计数不输出。
+    :param batch_size: 每完成多少个任务更新一次进度条，默认为配置中的 PROGRESS_UPDATE_BATCH_SIZE。
+    """
+
+    def __init__(
+        self,
+        total: int,
+        desc: str,
+        enabled: bool = True,
+        batch_size: int = PROGRESS_UPDATE_BATCH_SIZE,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.count = 0
+        self._bar: Optional[tqdm] = (
+            tqdm(
+                total=total,
+                desc=desc,
+                mininterval=0.5,
+                miniters=max(1, total // 200),
+            )
+            if enabled
+            else None
+        )
+
+    def advance(self) -> None:
+        """记录一个已完成的任务，每满一批更新一次进度条。"""
+        self.count += 1
+        if self._bar and self.count % self.batch_size == 0:
+            self._bar.update(self.batch_size)
+
+    def close(self) -> None:
+        """补齐最后不足一批的进度并关闭进度条，重复调用无副作用。"""
+        if self._bar:
+            self._bar.update(self.count % self.batch_size)
+            self._bar.close()
+            self._bar = None
+
+    def __enter__(self) -> "BatchedProgress":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
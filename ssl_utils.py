@@ -1,15 +1,33 @@
 import logging
 import socket
 import ssl
+from functools import lru_cache
 from typing import Optional, cast
 
-import validators
 from cryptography import x509
 from cryptography.hazmat.backends import default_backend
 from cryptography.x509 import DNSName, SubjectAlternativeName, Certificate
 from cryptography.x509.oid import NameOID, ExtensionOID
 
 from config import SSL_MAX_ALLOWED_LATENCY_SECONDS
+from url_class import is_valid_domain
+
+# 共享的 SSL 上下文：只为读取证书，不校验证书链与主机名，无需加载系统 CA
+_SSL_CTX = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+_SSL_CTX.check_hostname = False
+_SSL_CTX.verify_mode = ssl.CERT_NONE
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_domain(domain: str) -> bool:
+    """检查域名是否合法，结果会被缓存，证书中重复出现的域名无需再次校验。
+
+    与 ApiURL 共用 url_class.is_valid_domain，替换域名时的校验结果与此处一致。
+
+    :param domain: 已规范化的域名。
+    :return: 域名合法返回 True，否则返回 False。
+    """
+    return is_valid_domain(domain)
 
 
 def validate_and_normalize_domain(domain: str) -> Optional[str]:
@@ -21,30 +39,23 @@ def validate_and_normalize_domain(domain: str) -> Optional[str]:
     domain = domain.strip().lower()
     if domain.startswith("*."):
         domain = domain[2:]  # 移除通配符前缀
-    return domain if validators.domain(domain) else None
+    return domain if _is_valid_domain(domain) else None
 
 
 def try_connection(
     ip: str, port: int, ssl_sock_timeout: int = SSL_MAX_ALLOWED_LATENCY_SECONDS
 ) -> Optional[bytes]:
-    """使用默认的 SSL 上下文连接服务器并获取证书。
+    """使用共享的 SSL 上下文连接服务器并获取证书。
 
     :param ip: 目标 IP 地址或域名。
     :param port: 目标端口。
-    :param ssl_sock_timeout: SSL 连接超时时间。
+    :param ssl_sock_timeout: SSL 连接超时时间，同时作用于 TCP 连接与 TLS 握手。
     :return: 服务器的证书字节数据，如果连接失败返回 None。
     """
-    context = ssl.create_default_context()
-    context.check_hostname = False
-    context.verify_mode = ssl.CERT_NONE
-
     try:
-        with context.wrap_socket(
-            socket.socket(socket.AF_INET), server_hostname=ip
-        ) as sock:
-            sock.settimeout(ssl_sock_timeout)
-            sock.connect((ip, port))
-            return sock.getpeercert(binary_form=True)
+        with socket.create_connection((ip, port), timeout=ssl_sock_timeout) as raw:
+            with _SSL_CTX.wrap_socket(raw, server_hostname=ip) as sock:
+                return sock.getpeercert(binary_form=True)
     except (ssl.SSLError, ConnectionError, TimeoutError) as e:
         if isinstance(e, ssl.SSLError):
             logging.debug(
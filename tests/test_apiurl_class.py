@@ -1,8 +1,14 @@
 import unittest
+from unittest import mock
 from urllib.parse import urlparse
 
-from config import ACCESS_TOKEN_PATH, SERVICE_DEFAULT_PORT
-from url_class import ApiURL
+import pytest
+
+from config import SERVICE_DEFAULT_PORT
+from url_class import ApiURL, is_valid_domain
+
+# 测试用的访问令牌路径，不依赖环境变量 ACCESS_TOKEN_PATH
+TEST_TOKEN = "test-token"
 
 
 class TestApiURL(unittest.TestCase):
@@ -14,7 +20,7 @@ class TestApiURL(unittest.TestCase):
         self.no_scheme_url = "example.com/v1/translate"
         self.http_url = "http://example.com/v1/translate"
         self.custom_path_url = "https://example.com/api"
-        self.token_path_url = f"https://example.com/{ACCESS_TOKEN_PATH[0]}"
+        self.token_path_url = f"https://example.com/{TEST_TOKEN}"
         self.ip_url = "https://192.168.1.1/v1/translate"
 
     def test_from_url_valid(self):
@@ -53,10 +59,20 @@ class TestApiURL(unittest.TestCase):
         api_url = ApiURL.from_url(self.custom_path_url)
         self.assertEqual({"/api"}, api_url.path_set)
 
+    @mock.patch("url_class._TOKEN_PATHS", frozenset({f"/{TEST_TOKEN}"}))
     def test_from_url_token_path(self):
         # 测试令牌路径
         api_url = ApiURL.from_url(self.token_path_url)
-        self.assertIn(f"/{ACCESS_TOKEN_PATH[0]}/translate", api_url.path_set)
+        self.assertIn(f"/{TEST_TOKEN}/translate", api_url.path_set)
+
+    def test_from_url_token_path_after_cached_parse(self):
+        # 测试先解析过同一 URL 后再修改令牌路径，路径解析结果不受缓存影响
+        self.assertEqual(
+            {f"/{TEST_TOKEN}"}, ApiURL.from_url(self.token_path_url).path_set
+        )
+        with mock.patch("url_class._TOKEN_PATHS", frozenset({f"/{TEST_TOKEN}"})):
+            api_url = ApiURL.from_url(self.token_path_url)
+        self.assertEqual({f"/{TEST_TOKEN}/translate"}, api_url.path_set)
 
     def test_from_url_ip(self):
         # 测试 IP 地址作为主机
@@ -99,6 +115,11 @@ class TestApiURL(unittest.TestCase):
             self.assertIn(parsed_url.hostname, ["example.com"])
             self.assertIn(parsed_url.path, ["/translate", "/v1/translate"])
 
+    def test_iter_urls(self):
+        # 测试逐个生成的 URL 与列表结果一致
+        api_url = ApiURL.from_url(self.valid_url)
+        self.assertEqual(list(api_url.iter_urls()), api_url.generate_url_list())
+
     def test_add_same_host(self):
         # 测试相同主机的加法运算
         url1 = ApiURL.from_url("https://example.com/api/v1?param1=value1")
@@ -110,6 +131,23 @@ class TestApiURL(unittest.TestCase):
             combined.param_dict, {"param1": ["value1"], "param2": ["value2"]}
         )
 
+    def test_merge_inplace(self):
+        # 测试原地合并相同主机的实例
+        url1 = ApiURL.from_url("https://example.com/api/v1?param1=value1")
+        url2 = ApiURL.from_url("https://example.com:8080/api/v2?param1=value2")
+        url1.merge_inplace(url2)
+        self.assertEqual({"/api/v1", "/api/v2"}, url1.path_set)
+        self.assertEqual({8080, SERVICE_DEFAULT_PORT}, url1.port_set)
+        self.assertEqual({"param1": ["value1", "value2"]}, url1.param_dict)
+        self.assertEqual({"param1": ["value2"]}, url2.param_dict)  # 被合并的实例不变
+
+    def test_merge_inplace_different_host(self):
+        # 测试原地合并不同主机的实例
+        url1 = ApiURL.from_url("https://example1.com/api/v1")
+        url2 = ApiURL.from_url("https://example2.com/api/v2")
+        with self.assertRaises(ValueError):
+            url1.merge_inplace(url2)
+
     def test_add_different_host(self):
         # 测试不同主机的加法运算
         url1 = ApiURL.from_url("https://example1.com/api/v1")
@@ -142,11 +180,12 @@ class TestApiURL(unittest.TestCase):
         parsed = ApiURL._parse_path(path)
         self.assertIn("/translate", parsed)
 
+    @mock.patch("url_class._TOKEN_PATHS", frozenset({f"/{TEST_TOKEN}"}))
     def test_parse_path_token(self):
         # 测试令牌路径解析
-        path = f"/{ACCESS_TOKEN_PATH[0]}"
+        path = f"/{TEST_TOKEN}"
         parsed = ApiURL._parse_path(path)
-        self.assertIn(f"/{ACCESS_TOKEN_PATH[0]}/translate", parsed)
+        self.assertIn(f"/{TEST_TOKEN}/translate", parsed)
 
     def test_parse_path_custom(self):
         # 测试自定义路径解析
@@ -155,5 +194,55 @@ class TestApiURL(unittest.TestCase):
         self.assertIn("/custom/path", parsed)
 
 
+@pytest.mark.parametrize(
+    "url_in, expected",
+    [
+        ("https://example.com", "https://example.com"),
+        ("http://example.com", "https://example.com"),
+        ("example.com", "https://example.com"),
+        ("  example.com/v1/  ", "https://example.com/v1"),
+        ("https://example.com///", "https://example.com"),
+        (
+            "http://192.168.1.1:8080/v1/translate",
+            "https://192.168.1.1:8080/v1/translate",
+        ),
+    ],
+)
+def test_normalize_url(url_in, expected):
+    assert ApiURL._normalize_url(url_in) == expected
+
+
+@pytest.mark.parametrize("url_in", ["", "   "])
+def test_normalize_url_empty(url_in):
+    with pytest.raises(ValueError):
+        ApiURL._normalize_url(url_in)
+
+
+@pytest.mark.parametrize(
+    "domain, expected",
+    [
+        ("example.com", True),
+        ("例子.com", True),
+        (("a" * 62 + ".") * 3 + "a" * 60 + ".com", True),  # 恰好 253 个字符
+        (("a" * 60 + ".") * 5 + "com", False),  # 303 个字符，超过总长度限制
+        ("localhost", False),
+        ("foo_bar.com", False),
+        ("", False),
+    ],
+    ids=[
+        "ascii",
+        "idn",
+        "at_length_limit",
+        "over_length_limit",
+        "no_tld",
+        "underscore",
+        "empty",
+    ],
+)
+def test_is_valid_domain(domain, expected):
+    assert is_valid_domain(domain) is expected
+    assert ApiURL._validate_domain(domain) is expected
+
+
 if __name__ == "__main__":
     unittest.main()
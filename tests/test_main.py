@@ -3,7 +3,7 @@ import unittest
 from main import CategorizedResults
 
 
-class TestCategorizedResults(unittest.TestCase):
+class TestCategorizedResultsAssignedFields(unittest.TestCase):
     def setUp(self):
         self.results = CategorizedResults()
         self.results.available_https_endpoints = {
@@ -38,10 +38,6 @@ class TestCategorizedResults(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.results.sort("invalid_field")
 
-    def test_sort_unsortable_field(self):
-        with self.assertRaises(ValueError):
-            self.results.sort("failed_urls")
-
 
 class TestCategorizedResults(unittest.TestCase):
     def setUp(self):
@@ -83,6 +79,26 @@ class TestCategorizedResults(unittest.TestCase):
         }
         self.assertEqual(self.results.available_http_endpoints, expected)
 
+    def test_sort_dict_invalid_latency_last(self):
+        self.results.sort("rate_limited")
+        self.assertEqual(
+            [
+                "http://rate-limited.org",
+                "http://rate-limited.com",
+                "http://invalid.com",
+            ],
+            list(self.results.rate_limited),
+        )
+        self.results.sort("rate_limited", reverse=True)
+        self.assertEqual(
+            [
+                "http://rate-limited.com",
+                "http://rate-limited.org",
+                "http://invalid.com",
+            ],
+            list(self.results.rate_limited),
+        )
+
     def test_sort_list_ascending(self):
         self.results.sort("timeout_or_unreachable")
         expected = ["http://timeout.com", "http://unreachable.com"]
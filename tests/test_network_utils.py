@@ -1,68 +1,80 @@
 import unittest
 
+import pytest
+
+from config import REPLY_RULE
 from network_utils import (
     handle_error_response,
+    process_successful_response,
     ProcessedResponse,
     ReturnStatus,
 )
 
 
-class TestHandleErrorResponse(unittest.TestCase):
-    def test_server_error(self):
-        url = "https://example.com"
-        response = handle_error_response(url, 503, 0.12)
-        expected = {
-            "status": "50x",
-            "data": "HTTP error 503 at https://example.com",
-            "latency": 0.12,
-        }
-        self.assertEqual(response, expected)
+class FakeResponse:
+    """只提供 ``content`` 属性的响应替身，process_successful_response 只读取原始响应体。"""
 
-    def test_rate_limit_exceeded(self):
-        url = "https://example.com"
-        response = handle_error_response(url, 429, 0.25)
-        expected = {
-            "status": "429",
-            "data": "Rate limit exceeded (429) at https://example.com.",
-            "latency": 0.25,
-        }
-        self.assertEqual(response, expected)
+    def __init__(self, content: bytes = b""):
+        self.content = content
 
-    def test_unauthorized(self):
-        url = "https://example.com"
-        response = handle_error_response(url, 401, 0.30)
-        expected = {
-            "status": "401",
-            "data": "Unauthorized (401) at https://example.com.",
-            "latency": 0.30,
-        }
-        self.assertEqual(response, expected)
 
-    def test_unhandled_status_code(self):
-        url = "https://example.com"
-        response = handle_error_response(url, 418, 0.40)  # Example: 418 I'm a Teapot
-        expected = {
-            "status": "418",
-            "data": "Unhandled HTTP status code 418 at https://example.com.",
-            "latency": 0.40,
-        }
-        self.assertEqual(response, expected)
+@pytest.mark.parametrize(
+    "content, expected_status",
+    [
+        ('{"data": "你好，世界"}'.encode(), ReturnStatus.SUCCESS),
+        ('{"data": "你好 123"}'.encode(), ReturnStatus.INVALID_CONTENT),
+        (
+            b"<title>Attention Required! | Cloudflare</title>",
+            ReturnStatus.CONTENT_IS_CLOUDFLARE,
+        ),
+        (b"<html>Bad Gateway</html>", ReturnStatus.UNEXPECTED_CONTENT),
+        (b"[]", ReturnStatus.UNEXPECTED_CONTENT),
+    ],
+    ids=["success", "invalid_content", "cloudflare", "not_json", "not_object"],
+)
+def test_process_successful_response(content, expected_status):
+    result = process_successful_response(
+        "https://example.com", FakeResponse(content), 0.2, REPLY_RULE
+    )
+    assert result.status == expected_status
+    assert result.latency == 0.2
 
-    def test_status_code_in_500_range(self):
-        url = "https://example.com"
-        response = handle_error_response(url, 501, 0.50)
-        expected = {
-            "status": "50x",
-            "data": "HTTP error 501 at https://example.com",
-            "latency": 0.50,
-        }
-        self.assertEqual(response, expected)
+
+@pytest.mark.parametrize(
+    "status_code, latency, expected_status, expected_data",
+    [
+        (503, 0.12, ReturnStatus.SERVER_ERROR_50X, "HTTP error 503 at {url}"),
+        (501, 0.50, ReturnStatus.SERVER_ERROR_50X, "HTTP error 501 at {url}"),
+        (429, 0.25, 429, "Rate limit exceeded (429) at {url}."),
+        (401, 0.30, 401, "Unauthorized (401) at {url}."),
+        # Example: 418 I'm a Teapot
+        (418, 0.40, ReturnStatus.ERROR, "Unhandled HTTP status code 418 at {url}."),
+    ],
+    ids=[
+        "server_error",
+        "status_code_in_500_range",
+        "rate_limit_exceeded",
+        "unauthorized",
+        "unhandled_status_code",
+    ],
+)
+def test_handle_error_response(status_code, latency, expected_status, expected_data):
+    url = "https://example.com"
+    response = handle_error_response(url, status_code, latency)
+    assert response.status == expected_status
+    assert response.data == expected_data.format(url=url)
+    assert response.latency == latency
 
 
 class TestReturnStatus(unittest.TestCase):
     def test_match_statement(self):
         response = ProcessedResponse(status=ReturnStatus.SUCCESS, data={}, latency=0.1)
-        self.assertEqual(response.status, "SUCCESS")
+        self.assertIs(response.status, ReturnStatus.SUCCESS)
+        self.assertEqual(str(response.status), "SUCCESS")
+
+    def test_status_from_string(self):
+        self.assertIs(ProcessedResponse(status="SUCCESS").status, ReturnStatus.SUCCESS)
+        self.assertEqual(ProcessedResponse(status="429").status, 429)
 
 
 if __name__ == "__main__":
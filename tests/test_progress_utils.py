@@ -0,0 +1,22 @@
+from progress_utils import BatchedProgress
+
+
+def test_batched_progress_flushes_remainder():
+    """测试按批更新进度条，关闭时补齐不足一批的进度"""
+    progress = BatchedProgress(150, "test", batch_size=64)
+    bar = progress._bar
+    for _ in range(150):
+        progress.advance()
+
+    assert 128 == bar.n
+    progress.close()
+    assert 150 == bar.n
+
+
+def test_batched_progress_disabled():
+    """测试关闭进度条时仍然计数"""
+    with BatchedProgress(10, "test", enabled=False) as progress:
+        for _ in range(10):
+            progress.advance()
+
+    assert 10 == progress.count
@@ -1,19 +1,53 @@
+import ipaddress
 import re
 from dataclasses import dataclass, field
-from urllib.parse import urlparse, parse_qs, urlunparse, urlencode
-
-import validators
+from collections.abc import Iterator
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlparse, parse_qs, urlencode
 
 from config import DEFAULT_API_BASE_PATH, ACCESS_TOKEN_PATH, SERVICE_DEFAULT_PORT
 
+# 域名格式：总长度不超过 253 个字符，以点分隔的标签，每个标签 1-63 个字符且不以连字符开头或结尾，顶级域以字母结尾
+_DOMAIN_RE = re.compile(
+    r"(?=.{1,253}\Z)(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9][a-z0-9-]{0,61}[a-z]",
+    re.IGNORECASE,
+)
+
+
+def is_valid_domain(domain: Optional[str]) -> bool:
+    """验证域名有效性，国际化域名先转换为 Punycode 再匹配。
+
+    :param domain: 要验证的域名
+    :return: 布尔值，表示域名是否有效
+    """
+    if not domain:
+        return False
+    if not domain.isascii():
+        try:
+            domain = domain.encode("idna").decode("ascii")
+        except UnicodeError:
+            return False
+    return _DOMAIN_RE.fullmatch(domain) is not None
+
 
-@dataclass
+# 规范化后的默认基础路径与访问令牌路径，导入时计算一次
+_BASE_PATHS = frozenset(f"/{base.rstrip('/')}" for base in DEFAULT_API_BASE_PATH)
+_TOKEN_PATHS = frozenset(f"/{token.rstrip('/')}" for token in ACCESS_TOKEN_PATH)
+# 空路径或默认基础路径对应的全部翻译端点
+_DEFAULT_TRANSLATE_PATHS = frozenset(
+    {"/translate", *(f"{base}/translate" for base in _BASE_PATHS)}
+)
+
+
+@dataclass(eq=False, slots=True)
 class ApiURL:
     """API URL 数据类，用于处理、验证和生成 API URL。
 
     该类将输入的 URL 字符串解析为结构化的组件，并确保其有效性。
     支持 URL 规范化、主机验证、路径解析和查询参数处理。
     当两个 ApiURL 实例的主机相同时，可以通过加法运算符合并它们的端口、路径和查询参数。
+    实例的相等比较与哈希值只基于 host，集合和字典按主机去重；host 在创建后不应修改，哈希值在初始化时计算一次。
 
     :param host: 主机名（域名或 IP 地址）
     :param has_domain: 是否包含域名，默认为 False
@@ -30,38 +64,80 @@ class ApiURL:
     port_set: set[int] = field(default_factory=set)
     path_set: set[str] = field(default_factory=set)
     param_dict: dict[str, list[str]] = field(default_factory=dict)
+    # 编码后的查询字符串缓存，首次访问 encoded_query 时计算，合并查询参数时失效
+    _encoded_query: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # 基于 host 的哈希值缓存，去重时作为字典键反复使用
+    _hash: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._hash = hash(self.host)
 
     @classmethod
     def from_url(cls, url: str) -> "ApiURL":
         """从 URL 字符串创建 ApiURL 实例。
 
+        URL 的拆分与主机校验结果按 URL 字符串缓存；路径解析依赖模块级的路径配置，每次调用时重新计算。
+        每次返回的实例都持有独立的集合和字典，修改不会影响缓存。
+
         :param url: 要解析的 URL 字符串
         :return: 包含解析后 URL 组件的 ApiURL 实例
         :raises ValueError: 当 URL 格式无效或组件验证失败时
         """
-        normalized_url = cls._normalize_url(url)
-        parsed_url = urlparse(normalized_url)
-
-        if not cls._is_valid_url(normalized_url):
-            raise ValueError(f"Invalid URL format: {url}")
-
-        has_domain = False
-        if cls._validate_domain(parsed_url.hostname):
-            has_domain = True
-
-        host = parsed_url.hostname
-        port = {parsed_url.port} if parsed_url.port else set("")
-        # 添加服务默认端口
-        port.add(SERVICE_DEFAULT_PORT)
-        path = cls._parse_path(parsed_url.path)
-        query = cls._parse_query(parsed_url.query)
+        host, has_domain, port, path, query = cls._parse_components(url)
 
         return cls(
             host=host,
             has_domain=has_domain,
-            port_set=port,
-            path_set=path,
-            param_dict=query,
+            port_set=set(port),
+            path_set=cls._parse_path(path),
+            param_dict={key: list(values) for key, values in query},
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_components(
+        url: str,
+    ) -> tuple[
+        str,
+        bool,
+        frozenset[int],
+        str,
+        tuple[tuple[str, tuple[str, ...]], ...],
+    ]:
+        """拆分并校验 URL 字符串，返回不可变的组件元组，结果会被缓存。
+
+        只缓存与模块级配置无关的结果，路径保持原始字符串，由调用方再交给 ``_parse_path`` 解析。
+
+        :param url: 要解析的 URL 字符串
+        :return: (主机, 是否为域名, 端口集合, 原始路径, 查询参数) 元组
+        :raises ValueError: 当 URL 格式无效或组件验证失败时
+        """
+        normalized_url = ApiURL._normalize_url(url)
+        host, parsed_port, parsed_path, parsed_query = ApiURL._fast_split(
+            normalized_url
+        )
+        has_domain = ApiURL._validate_domain(host)
+
+        # 标准化后协议固定为 https，URL 是否有效由拆分出的主机决定：必须是合法域名或 IP 地址
+        if not has_domain and not ApiURL._validate_ip(host):
+            raise ValueError(f"Invalid URL format: {url}")
+
+        # 端口集合始终包含服务默认端口
+        port = (
+            {parsed_port, SERVICE_DEFAULT_PORT}
+            if parsed_port
+            else {SERVICE_DEFAULT_PORT}
+        )
+        query = ApiURL._parse_query(parsed_query)
+
+        return (
+            host,
+            has_domain,
+            frozenset(port),
+            parsed_path,
+            tuple((key, tuple(values)) for key, values in query.items()),
         )
 
     @classmethod
@@ -94,24 +170,37 @@ class ApiURL:
 
         :return: 包含所有有效 URL 的列表
         """
+        return list(self.iter_urls())
+
+    def iter_urls(self) -> Iterator[str]:
+        """逐个生成 URL，不预先构建完整列表，适合直接写入去重集合。
+
+        :return: 依次产出所有有效 URL 的迭代器
+        """
         ports = set(self.port_set or {""})
         ports.add(SERVICE_DEFAULT_PORT)
+        paths = tuple(self.path_set) or ("",)
+        # 查询字符串与协议、端口、路径无关，只编码一次
+        query = f"?{self.encoded_query}" if self.param_dict else ""
 
-        return [
-            urlunparse(
-                (
-                    scheme,
-                    f"{self.host}:{port}" if port else self.host,
-                    path,
-                    "",  # fragment
-                    urlencode(self.param_dict, doseq=True) if self.param_dict else "",
-                    "",  # params
-                )
-            )
-            for scheme in ("https", "http")
-            for port in (ports | {443 if scheme == "https" else 80})
-            for path in (self.path_set or [""])
-        ]
+        for scheme in ("https", "http"):
+            for port in ports | {443 if scheme == "https" else 80}:
+                netloc = f"{self.host}:{port}" if port else self.host
+                prefix = f"{scheme}://{netloc}"
+                for path in paths:
+                    yield f"{prefix}{path}{query}"
+
+    @property
+    def encoded_query(self) -> str:
+        """编码后的查询字符串（不含 ``?``），结果缓存在实例上。
+
+        直接修改 param_dict 后需调用 merge_inplace 等合并方法或重新创建实例，缓存才会更新。
+
+        :return: 查询字符串
+        """
+        if self._encoded_query is None:
+            self._encoded_query = urlencode(self.param_dict, doseq=True)
+        return self._encoded_query
 
     @staticmethod
     def _normalize_url(url: str) -> str:
@@ -125,7 +214,7 @@ class ApiURL:
         if not url:
             raise ValueError("Empty URL provided")
 
-        url = re.sub(r"/+$", "", url)
+        url = url.rstrip("/")
 
         if url.startswith("http://"):
             url = f"https://{url[7:]}"
@@ -135,13 +224,41 @@ class ApiURL:
         return url
 
     @staticmethod
-    def _is_valid_url(url: str) -> bool:
-        """验证 URL 格式是否有效。
+    def _fast_split(url: str) -> tuple[Optional[str], Optional[int], str, str]:
+        """拆分已标准化的 URL，返回主机、端口、路径和查询字符串。
+
+        标准化后的 URL 形如 ``https://host[:port][/path][?query]``，使用字符串切分即可完成；
+        包含用户信息、IPv6 地址或路径参数等少见形式时回退到 ``urlparse``。
 
-        :param url: 要验证的 URL 字符串
-        :return: URL 格式是否有效
+        :param url: 经 ``_normalize_url`` 标准化的 URL 字符串
+        :return: (小写主机名, 端口, 路径, 查询字符串) 元组，主机或端口缺失时为 None
+        :raises ValueError: 当端口不是合法的整数时
         """
-        return bool(validators.url(url))
+        rest = url.partition("://")[2].partition("#")[0]
+        rest, _, query = rest.partition("?")
+        netloc, slash, path = rest.partition("/")
+
+        if "@" in netloc or "[" in netloc or ";" in path:
+            parsed_url = urlparse(url)
+            return (
+                parsed_url.hostname,
+                parsed_url.port,
+                parsed_url.path,
+                parsed_url.query,
+            )
+
+        host, _, port_str = netloc.partition(":")
+        port = None
+        if port_str:
+            if not (port_str.isascii() and port_str.isdigit()):
+                raise ValueError(
+                    f"Port could not be cast to integer value as {port_str!r}"
+                )
+            port = int(port_str)
+            if port > 65535:
+                raise ValueError("Port out of range 0-65535")
+
+        return host.lower() or None, port, f"{slash}{path}", query
 
     @staticmethod
     def _validate_ip(ip: str) -> bool:
@@ -151,7 +268,9 @@ class ApiURL:
         :return: 布尔值，表示 IP 地址是否有效
         :raises ValueError: 当 IP 地址无效时
         """
-        if not validators.ipv4(ip) and not validators.ipv6(ip):
+        try:
+            ipaddress.ip_address(ip)
+        except ValueError:
             return False
         return True
 
@@ -163,9 +282,7 @@ class ApiURL:
         :return: 布尔值，表示域名是否有效
         :raises ValueError: 当域名无效时
         """
-        if not validators.domain(domain):
-            return False
-        return True
+        return is_valid_domain(domain)
 
     @staticmethod
     def _parse_query(query: str) -> dict[str, list[str]]:
@@ -193,29 +310,20 @@ class ApiURL:
         :param path: 要解析的路径字符串
         :return: 有效路径的集合
         """
-        normalized_path = re.sub(r"/+$", "", path)
+        normalized_path = path.rstrip("/")
         if normalized_path.endswith("/translate"):
             normalized_path = normalized_path[:-10]
-        valid_paths = set()
 
         # 处理空路径和默认路径
-        if normalized_path == "" or any(
-            normalized_path == f"/{base.rstrip('/')}" for base in DEFAULT_API_BASE_PATH
-        ):
-            valid_paths.add("/translate")
-            for base in DEFAULT_API_BASE_PATH:
-                valid_paths.add(f"/{base.rstrip('/')}/translate")
+        if normalized_path == "" or normalized_path in _BASE_PATHS:
+            return set(_DEFAULT_TRANSLATE_PATHS)
 
         # 处理令牌路径
-        elif any(
-            normalized_path == f"/{token.rstrip('/')}" for token in ACCESS_TOKEN_PATH
-        ):
-            valid_paths.add(f"{normalized_path}/translate")
-        # 自定义API端点
-        else:
-            valid_paths.add(normalized_path)
+        if normalized_path in _TOKEN_PATHS:
+            return {f"{normalized_path}/translate"}
 
-        return valid_paths
+        # 自定义API端点
+        return {normalized_path}
 
     def __add__(self, other: "ApiURL") -> "ApiURL":
         """实现两个 ApiURL 实例的加法运算。
@@ -232,27 +340,43 @@ class ApiURL:
         if self.host != other.host:
             raise ValueError("Cannot add ApiURLs with different domains")
 
-        # 合并端口
-        new_port = self.port_set | other.port_set
-
-        # 合并路径
-        new_path = self.path_set | other.path_set
-
-        # 合并查询参数
-        new_query = self.param_dict.copy()
-        for key, value in other.param_dict.items():
-            if key in new_query:
-                new_query[key] = list(set(new_query[key] + value))
-            else:
-                new_query[key] = value
-
-        return ApiURL(
+        # 合并端口、路径，并复制查询参数列表避免与原实例共享
+        merged_url = ApiURL(
             host=self.host,
             has_domain=self.has_domain,
-            port_set=new_port,
-            path_set=new_path,
-            param_dict=new_query,
+            port_set=self.port_set | other.port_set,
+            path_set=self.path_set | other.path_set,
+            param_dict={key: values.copy() for key, values in self.param_dict.items()},
         )
+        merged_url._merge_params(other.param_dict)
+        return merged_url
+
+    def merge_inplace(self, other: "ApiURL") -> None:
+        """将另一个 ApiURL 实例的端口、路径和查询参数原地合并到当前实例。
+
+        与加法运算不同，不会创建新实例，适合对同一主机的多个实例累积合并。
+
+        :param other: 另一个 ApiURL 实例
+        :raises ValueError: 当两个实例的域名不同时
+        """
+        if self.host != other.host:
+            raise ValueError("Cannot add ApiURLs with different domains")
+
+        self.port_set.update(other.port_set)
+        self.path_set.update(other.path_set)
+        self._merge_params(other.param_dict)
+
+    def _merge_params(self, param_dict: dict[str, list[str]]) -> None:
+        """将查询参数合并到当前实例，保持原有顺序追加新值。
+
+        :param param_dict: 要合并的查询参数字典
+        """
+        self._encoded_query = None
+        for key, values in param_dict.items():
+            merged_values = self.param_dict.setdefault(key, [])
+            merged_values.extend(
+                value for value in values if value not in merged_values
+            )
 
     def __eq__(self, other: "ApiURL") -> bool:
         """比较两个 ApiURL 实例是否相等。
@@ -269,9 +393,9 @@ class ApiURL:
     def __hash__(self) -> int:
         """计算实例的哈希值。
 
-        :return: 基于 host 属性的哈希值
+        :return: 基于 host 属性的哈希值，初始化时缓存
         """
-        return hash(self.host)
+        return self._hash
 
 
 if __name__ == "__main__":
@@ -1,19 +1,45 @@
+import atexit
 import logging
-import os
+import re
+import threading
+from collections import defaultdict
+from collections.abc import Iterable
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 
-from tqdm import tqdm
-
 from config import (
     FILE_PRIORITY,
     SHOW_SSL_PROGRESS_BAR,
     SSL_CERT_CHECK_MAX_WORKERS,
     PROCESS_CERTIFICATE,
 )
+from progress_utils import BatchedProgress
 from ssl_utils import get_domains_from_cert
 from url_class import ApiURL
 
+# 证书检测共用的线程池，首次使用时创建，进程退出时关闭
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """获取共享的证书检测线程池，多次调用复用同一组工作线程。
+
+    :return: 共享的线程池。
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=SSL_CERT_CHECK_MAX_WORKERS, thread_name_prefix="ssl"
+            )
+            atexit.register(_executor.shutdown)
+        return _executor
+
+
+# 候选 URL 的粗略格式：可选的 http(s) 协议，随后是不含空白字符的主机和路径
+_URL_CANDIDATE_RE = re.compile(r"(?:https?://)?[^\s/$.?#][^\s]*", re.IGNORECASE)
+
 
 def deduplicate_urls(url_list: list[ApiURL]) -> list[ApiURL]:
     """使用字典对具有相同 host 的 ApiURL 类列表进行去重和合并。
@@ -25,19 +51,21 @@ def deduplicate_urls(url_list: list[ApiURL]) -> list[ApiURL]:
     """
 
     # 创建字典，键是 host，值是对应的 ApiURL 实例列表
-    host_to_urls = {}
+    host_to_urls: defaultdict[str, list[ApiURL]] = defaultdict(list)
     for url in url_list:
-        if url.host in host_to_urls:
-            host_to_urls[url.host].append(url)
-        else:
-            host_to_urls[url.host] = [url]
+        host_to_urls[url.host].append(url)
 
     # 遍历字典的值，合并相同 host 的 ApiURL 实例
     merged_url_list = []
     for url_list_in_host in host_to_urls.values():
-        merged_url = url_list_in_host[0]
-        for url in url_list_in_host[1:]:
-            merged_url += url
+        if len(url_list_in_host) == 1:
+            merged_url_list.append(url_list_in_host[0])
+            continue
+
+        # 前两个实例相加得到新的累加器，其余实例原地合并，避免每次合并都复制一遍
+        merged_url = url_list_in_host[0] + url_list_in_host[1]
+        for url in url_list_in_host[2:]:
+            merged_url.merge_inplace(url)
         merged_url_list.append(merged_url)
 
     return merged_url_list
@@ -56,21 +84,31 @@ def load_urls_from_file(file_priority: Optional[list[str]] = None) -> list[ApiUR
     urls_list = []
 
     for file_path in file_priority:
-        if os.path.exists(file_path):
-            logging.info(f"Loading URLs from file: {file_path}")
-            try:
-                with open(file_path, "r", encoding="utf-8") as file:
-                    for line_number, line in enumerate(file, start=1):
-                        if line.strip():
-                            try:
-                                urls_list.append(ApiURL.from_url(line))
-                            except Exception as e:
-                                logging.warning(
-                                    f"Failed to load URL at line {line_number}: {line.strip()}. Error: {e}"
-                                )
-                break
-            except (PermissionError, IOError) as e:
-                logging.error(f"Failed to read file {file_path}: {e}")
+        # 直接尝试打开文件，不存在时跳到下一个候选文件，省去单独的存在性检查
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                logging.info(f"Loading URLs from file: {file_path}")
+                for line_number, line in enumerate(file, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    # 明显不是 URL 的行直接跳过，不进入解析与异常处理
+                    if not _URL_CANDIDATE_RE.fullmatch(line):
+                        logging.warning(
+                            f"Failed to load URL at line {line_number}: {line}. Error: not a URL"
+                        )
+                        continue
+                    try:
+                        urls_list.append(ApiURL.from_url(line))
+                    except Exception as e:
+                        logging.warning(
+                            f"Failed to load URL at line {line_number}: {line}. Error: {e}"
+                        )
+            break
+        except FileNotFoundError:
+            continue
+        except (PermissionError, IOError) as e:
+            logging.error(f"Failed to read file {file_path}: {e}")
 
     urls_list = deduplicate_urls(urls_list)
 
@@ -84,6 +122,26 @@ def load_urls_from_file(file_priority: Optional[list[str]] = None) -> list[ApiUR
     return urls_list  # 不排序，按需调整
 
 
+def _fetch_all_ports(
+    host: str, ports: Iterable[int]
+) -> tuple[bool, list[str] | Exception]:
+    """依次获取同一主机各端口证书中的域名，合并去重后返回。
+
+    异常在工作线程内捕获并作为结果返回，调用方无需包裹 ``future.result()``。
+
+    :param host: 目标 IP 地址。
+    :param ports: 需要检查的端口。
+    :return: (是否成功, 按首次出现顺序排列的域名列表或捕获的异常) 元组。
+    """
+    domains: dict[str, None] = {}
+    try:
+        for port in ports:
+            domains.update(dict.fromkeys(get_domains_from_cert(host, port)))
+    except Exception as e:
+        return False, e
+    return True, list(domains)
+
+
 def fetch_and_normalize_url_list(
     raw_url_list: list[ApiURL], show_progress: bool = True
 ) -> list[ApiURL] | None:
@@ -94,59 +152,45 @@ def fetch_and_normalize_url_list(
     :return: 包含所有处理后的 URL 的列表，IP URL 会保留，同时添加解析出的域名 URL。
     """
     process_url_list = raw_url_list.copy()
-    # 创建线程池执行多线程任务
-    with ThreadPoolExecutor(max_workers=SSL_CERT_CHECK_MAX_WORKERS) as executor:
-
-        # 筛选 IP URL
-        ip_url_list = [ip_url for ip_url in process_url_list if not ip_url.has_domain]
-
-        # 初始化进度条
-        progress_bar: Optional[tqdm] = (
-            tqdm(total=len(ip_url_list), desc="Processing IP URLs")
-            if show_progress
-            else None
-        )
-
-        # 提前过滤掉端口为80的URL
-        filtered_urls = {
-            (url, port) for url in ip_url_list for port in url.port_set if port != 80
-        }
-
-        # 使用列表推导式提交任务
-        future_to_url = {
-            executor.submit(get_domains_from_cert, url.host, port): url
-            for url, port in filtered_urls
-        }
-
-        # 收集解析结果
-        to_add = []
+    # 使用共享的线程池执行多线程任务
+    executor = _get_executor()
+
+    # 筛选 IP URL
+    ip_url_list = [ip_url for ip_url in process_url_list if not ip_url.has_domain]
+
+    # 每个主机提交一个任务，依次检查其所有端口，提前过滤掉端口为80的URL
+    future_to_url = {}
+    for url in ip_url_list:
+        ports = [port for port in url.port_set if port != 80]
+        if ports:
+            future_to_url[executor.submit(_fetch_all_ports, url.host, ports)] = url
+
+    # 收集解析结果
+    to_add = []
+    with BatchedProgress(
+        len(future_to_url), "Processing IP URLs", show_progress
+    ) as progress:
         for future in as_completed(future_to_url):
             original_url = future_to_url[future]
-            try:
-                domain_list = future.result()
-                if domain_list:
-                    for domain in domain_list:
-                        try:
-                            new_url = ApiURL.replace_domain(original_url, domain)
-                        except ValueError as e:
-                            logging.info(f"Error replacing domain: {e}")
-                        else:
-                            if new_url is not None:
-                                to_add.append(new_url)
-                    logging.info(
-                        f"Found {len(domain_list)} domains for {original_url.host},{domain_list}"
-                    )
-            except Exception as e:
-                logging.info(f"Error resolving host from {original_url.host}: {e}")
-            finally:
-                if progress_bar:
-                    progress_bar.update(1)
-
-        # 关闭进度条
-        if progress_bar:
-            progress_bar.close()
-
-        process_url_list.extend(to_add)
+            ok, result = future.result()
+            progress.advance()
+
+            if not ok:
+                logging.info(f"Error resolving host from {original_url.host}: {result}")
+                continue
+            if not result:
+                continue
+
+            for domain in result:
+                try:
+                    to_add.append(ApiURL.replace_domain(original_url, domain))
+                except ValueError as e:
+                    logging.info(f"Error replacing domain: {e}")
+            logging.info(
+                f"Found {len(result)} domains for {original_url.host},{result}"
+            )
+
+    process_url_list.extend(to_add)
 
     return deduplicate_urls(process_url_list)
 
@@ -159,7 +203,7 @@ def generate_urls(
     """生成处理后的 URL 列表，并根据配置决定是否进行证书检测和域名替换。
 
     该函数从指定的输入文件中加载原始 URL 列表，并根据配置决定是否对 IP 类型的 URL 进行证书检测和域名替换。
-    处理后的 URL 列表会进一步调用 `generate_url_list` 方法生成最终的 URL 列表，并确保去重。
+    处理后的 URL 列表会进一步调用 `iter_urls` 方法逐个生成最终的 URL，并确保去重。
 
     :param input_file: 输入文件路径列表，包含原始 URL 列表。默认从 `FILE_PRIORITY` 配置中读取。
     :param show_progress: 是否显示进度条。默认从 `SHOW_SSL_PROGRESS_BAR` 配置中读取。
@@ -187,13 +231,12 @@ def generate_urls(
             f"Returning {len(raw_urls)} raw URLs without certificate processing."
         )
 
+    # 使用集合去重，这是 URL 字符串唯一的一次去重
     all_urls = set()
     for api_url in processed_urls:
-        for url in api_url.generate_url_list():
-            all_urls.add(url)
+        all_urls.update(api_url.iter_urls())
 
-    # 去重返回最终的 URL 列表
-    final_urls = list(set(all_urls))
+    final_urls = list(all_urls)
     logging.info(f"Final URL count after adding API paths: {len(final_urls)}")
     return final_urls
 